@@ -1,6 +1,10 @@
 import os
+from contextlib import asynccontextmanager
+from typing import Optional
+
 import httpx
 from fastapi import FastAPI, Request, HTTPException
+from starlette.background import BackgroundTask
 from starlette.responses import StreamingResponse
 
 # --- Configuration ---
@@ -8,7 +12,56 @@ TARGET_HOST = os.environ.get("TARGET_HOST", "http://localhost:8000")
 PROXY_PORT = int(os.environ.get("PROXY_PORT", "8001"))
 MCP_API_KEY = os.environ.get("MCP_API_KEY")
 
-app = FastAPI()
+# Headers that are never copied from the client: hop-by-hop headers describe
+# the client connection only, and accept/host are rewritten for the target.
+# Names are lowercase bytes to match ASGI raw headers.
+HOP_BY_HOP = frozenset({
+    b"connection",
+    b"keep-alive",
+    b"proxy-authenticate",
+    b"proxy-authorization",
+    b"te",
+    b"trailers",
+    b"transfer-encoding",
+    b"upgrade",
+    b"content-length",
+    b"host",
+    b"accept",
+})
+
+# Upstream response headers that are not copied back to the client. The body
+# is re-framed by StreamingResponse and decoded by aiter_bytes(), so the
+# upstream framing and content-encoding no longer apply.
+RESPONSE_EXCLUDED_HEADERS = HOP_BY_HOP | {b"content-encoding"}
+
+# Shared upstream client, created on startup so every forwarded request
+# reuses pooled keep-alive connections to the MCP server.
+client: Optional[httpx.AsyncClient] = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the shared upstream client on startup and close it on shutdown."""
+    global client
+    # HTTP/2 multiplexes concurrent /mcp calls over a single upstream connection
+    client = httpx.AsyncClient(
+        base_url=TARGET_HOST,
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=200,
+            max_keepalive_connections=50,
+            keepalive_expiry=300,
+        ),
+        timeout=httpx.Timeout(30.0, connect=5.0),
+    )
+    try:
+        yield
+    finally:
+        await client.aclose()
+        client = None
+
+
+app = FastAPI(lifespan=lifespan)
 
 @app.post("/mcp")
 async def mcp_proxy(request: Request):
@@ -17,33 +70,39 @@ async def mcp_proxy(request: Request):
     fixes the headers, and forwards them to the actual MCP server.
     """
     try:
-        # Extract the body and headers from the incoming request
-        body = await request.body()
-        headers = dict(request.headers)
+        # Keep only end-to-end headers; the body is streamed through without
+        # buffering and httpx frames it with chunked transfer encoding
+        headers = [(k, v) for k, v in request.headers.raw if k not in HOP_BY_HOP]
 
         # --- Header Correction ---
         # Forcefully set the correct Accept header
-        headers["accept"] = "application/json, text/event-stream"
+        headers.append((b"accept", b"application/json, text/event-stream"))
         # Ensure the host header is correct for the target service
-        headers["host"] = "localhost:8000"
+        headers.append((b"host", b"localhost:8000"))
 
         # --- Forward the Request ---
-        async with httpx.AsyncClient() as client:
-            # Stream the request to the target server
-            mcp_request = client.build_request(
-                "POST",
-                f"{TARGET_HOST}/mcp",
-                content=body,
-                headers=headers,
-            )
-            mcp_response = await client.send(mcp_request, stream=True)
-
-            # --- Stream the Response Back ---
-            return StreamingResponse(
-                mcp_response.aiter_bytes(),
-                status_code=mcp_response.status_code,
-                headers=mcp_response.headers,
-            )
+        # Stream the request to the target server over the shared client
+        mcp_request = client.build_request(
+            "POST",
+            "/mcp",
+            content=request.stream(),
+            headers=headers,
+        )
+        mcp_response = await client.send(mcp_request, stream=True)
+
+        # --- Stream the Response Back ---
+        # Closing the upstream response afterwards returns its connection to the pool
+        response = StreamingResponse(
+            mcp_response.aiter_bytes(),
+            status_code=mcp_response.status_code,
+            background=BackgroundTask(mcp_response.aclose),
+        )
+        response.raw_headers.extend(
+            (k.lower(), v)
+            for k, v in mcp_response.headers.raw
+            if k.lower() not in RESPONSE_EXCLUDED_HEADERS
+        )
+        return response
 
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
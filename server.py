@@ -2,9 +2,10 @@
 import base64
 import binascii
 import os
-from typing import Optional, Dict, Any
+from typing import Annotated, Optional, Dict, Any, Iterator, Tuple
 import secrets
 import hashlib
+from collections import OrderedDict
 import asyncio
 import logging
 import signal
@@ -12,27 +13,42 @@ import sys
 
 from fastmcp import FastMCP, Context, settings
 from mcp import ServerSession
+from pydantic import Field
 
 # OpenAI client (async)
-from openai import AsyncOpenAI
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 
 # Import Request for middleware
+from starlette.datastructures import QueryParams
 from starlette.requests import Request
-from starlette.responses import JSONResponse, PlainTextResponse
-from starlette.datastructures import MutableHeaders
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse, PlainTextResponse, Response
 from starlette.middleware import Middleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 # HTTP utilities
 # (FastAPI fully re-exports Starlette responses, so stick to Starlette primitives)
 
 # Import anyio for proper error handling
 import anyio
 
-# Configure logging
+# Fast JSON encoding for HTTP error responses
+import orjson
+
+# Configure logging (second-resolution timestamps skip the per-record msec formatting)
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S',
 )
+# Per-request INFO chatter from the MCP request handler, transport and HTTP client
+# libraries ("Processing request of type ..." comes from mcp.server.lowlevel.server)
+for noisy_logger in (
+    "mcp.server.lowlevel.server",
+    "mcp.server.streamable_http",
+    "mcp.server.streamable_http_manager",
+    "httpx",
+):
+    logging.getLogger(noisy_logger).setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
 # --- Config ---
@@ -43,6 +59,17 @@ if not OPENAI_API_KEY:
 # Optional: override API base (e.g., Azure OpenAI or a proxy)
 OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL")  # e.g., "https://api.openai.com/v1"
 
+# Defaults for the generate tool, resolved once at import
+OPENAI_MODEL = os.environ.get("OPENAI_MODEL", "gpt-4o-mini")
+OPENAI_TEMPERATURE = float(os.environ.get("OPENAI_TEMPERATURE", "0.2"))
+
+# In-process cache of temperature-0 completions (0 disables it)
+OPENAI_RESPONSE_CACHE_SIZE = int(os.environ.get("OPENAI_RESPONSE_CACHE_SIZE", "1024"))
+
+# Connection pool for OpenAI requests (the library default of 10 starves under load)
+OPENAI_MAX_CONNECTIONS = int(os.environ.get("OPENAI_MAX_CONNECTIONS", "1000"))
+OPENAI_MAX_KEEPALIVE = int(os.environ.get("OPENAI_MAX_KEEPALIVE", "100"))
+
 # MCP Server Authentication
 MCP_API_KEY = os.environ.get("MCP_API_KEY")
 if not MCP_API_KEY:
@@ -51,18 +78,32 @@ if not MCP_API_KEY:
     print(f"Generated MCP API Key: {MCP_API_KEY}")
     print("Set MCP_API_KEY environment variable to use a custom key.")
 
-# Hash the API key for secure comparison
-MCP_API_KEY_HASH = hashlib.sha256(MCP_API_KEY.encode()).hexdigest()
+# Encode the API key once for constant-time comparison
+MCP_API_KEY_BYTES = MCP_API_KEY.encode()
+
+# Shared HTTP/2 connection pool so tool calls reuse keep-alive connections to OpenAI
+http_client = DefaultAsyncHttpxClient(
+    http2=True,
+    limits=httpx.Limits(
+        max_connections=OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=OPENAI_MAX_KEEPALIVE,
+        keepalive_expiry=None,
+    ),
+    timeout=httpx.Timeout(60.0, connect=10.0),
+)
 
-client = AsyncOpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL)
+client = AsyncOpenAI(
+    api_key=OPENAI_API_KEY,
+    base_url=OPENAI_BASE_URL,
+    http_client=http_client,
+)
 
 # Authentication function
 def verify_api_key(provided_key: str) -> bool:
     """Verify the provided API key against the configured key."""
     if not provided_key:
         return False
-    provided_hash = hashlib.sha256(provided_key.encode()).hexdigest()
-    return secrets.compare_digest(provided_hash, MCP_API_KEY_HASH)
+    return secrets.compare_digest(provided_key.encode(), MCP_API_KEY_BYTES)
 
 # Create the MCP server
 mcp = FastMCP(
@@ -73,118 +114,191 @@ mcp = FastMCP(
 
 # --- HTTP middleware for compatibility and robustness ---
 
-class ForceAcceptHeaderMiddleware(BaseHTTPMiddleware):
-    """Ensure POST /mcp requests advertise the media types required by MCP."""
+class ORJSONResponse(JSONResponse):
+    """JSONResponse that encodes straight to bytes with orjson."""
 
-    async def dispatch(self, request: Request, call_next):  # type: ignore[override]
-        if request.scope.get("type") == "http" and request.url.path == "/mcp":
-            headers = MutableHeaders(scope=request.scope)
-            accept_header = headers.get("accept", "")
-            accept_values = [value.strip() for value in accept_header.split(",") if value.strip()]
-            normalized = {value.lower() for value in accept_values}
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
 
-            updated = False
-            if "application/json" not in normalized:
-                accept_values.append("application/json")
-                updated = True
-            if "text/event-stream" not in normalized:
-                accept_values.append("text/event-stream")
-                updated = True
 
-            if updated:
-                headers["accept"] = ", ".join(accept_values)
-                logger.debug("Adjusted Accept header for /mcp request: %s", headers["accept"])
+# Rejections are identical every time, so these are rendered once and reused;
+# Starlette responses hold no per-request state.
+_UNAUTHORIZED_RESPONSE = ORJSONResponse(
+    {"error": "Invalid or missing API key"},
+    status_code=401,
+)
+_CLIENT_DISCONNECTED_RESPONSE = PlainTextResponse("Client disconnected", status_code=499)
+
+
+# MCP HTTP transport endpoints that require an API key; every other route
+# (including the /health and / probes) is left open.
+_MCP_PATHS = frozenset({"/mcp", "/sse"})
+
+# Header names that may carry the API key, in the order they are checked.
+# ASGI guarantees lowercase header names, so raw bytes compare directly.
+_ALTERNATE_KEY_HEADERS = (b"x-api-key", b"api-key", b"mcp-api-key")
+_CREDENTIAL_HEADERS = frozenset({b"authorization", *_ALTERNATE_KEY_HEADERS})
+
+
+def _force_accept_header(scope: Scope) -> None:
+    """Ensure a /mcp request advertises the media types required by MCP."""
+    raw_headers = scope["headers"]
+    accept_index = None
+    accept_header = ""
+    for index, (name, value) in enumerate(raw_headers):
+        if name == b"accept":
+            accept_index = index
+            accept_header = value.decode("latin-1")
+            break
+
+    # Substring checks on the lowercased header replace split/strip/set parsing
+    lowered = accept_header.lower()
+    extras = []
+    if "application/json" not in lowered:
+        extras.append("application/json")
+    if "text/event-stream" not in lowered:
+        extras.append("text/event-stream")
+    # Compliant clients already advertise both types and are left untouched
+    if not extras:
+        return
+
+    base = accept_header.strip(" ,")
+    accept_header = ", ".join([base, *extras]) if base else ", ".join(extras)
+
+    # Rewrite the Accept entry in place rather than rebuilding the header list
+    # (scope["headers"] is only guaranteed to be an iterable, hence the fallback)
+    if not isinstance(raw_headers, list):
+        raw_headers = scope["headers"] = list(raw_headers)
+    value = accept_header.encode("latin-1")
+    if accept_index is None:
+        raw_headers.append((b"accept", value))
+    else:
+        raw_headers[accept_index] = (b"accept", value)
+    logger.debug("Adjusted Accept header for /mcp request: %s", accept_header)
 
-        return await call_next(request)
 
+def _iter_credentials(scope: Scope) -> Iterator[Tuple[str, str]]:
+    """Yield ``(source, key)`` pairs for every credential on the request.
 
-class ErrorHandlingMiddleware(BaseHTTPMiddleware):
-    """Convert transport exceptions into friendly HTTP responses."""
+    Sources are produced lazily in priority order so callers can stop at the
+    first valid key without inspecting the remaining headers or query string.
+    """
 
-    async def dispatch(self, request: Request, call_next):  # type: ignore[override]
-        try:
-            return await call_next(request)
-        except anyio.ClosedResourceError:
-            logger.info("Client disconnected - ClosedResourceError handled by middleware")
-            return PlainTextResponse("Client disconnected", status_code=499)
-        except Exception as exc:  # pragma: no cover - defensive guard
-            logger.error("Error in request processing: %s", exc, exc_info=True)
-            return JSONResponse(
-                content={"error": "Internal server error", "detail": str(exc)},
-                status_code=500,
-            )
+    def clean(value: Optional[str]) -> str:
+        return value.strip() if value else ""
+
+    # One pass over the raw header tuples picks out every credential header
+    found: Dict[bytes, str] = {}
+    for name, value in scope["headers"]:
+        if name in _CREDENTIAL_HEADERS and name not in found:
+            found[name] = value.decode("latin-1")
+
+    auth_header = found.get(b"authorization")
+    if auth_header:
+        normalized = auth_header.strip()
+        lower_normalized = normalized.lower()
+        if lower_normalized.startswith("bearer "):
+            yield "bearer", normalized[7:].strip()
+        elif lower_normalized.startswith("basic "):
+            token = normalized[6:].strip()
+            try:
+                decoded = base64.b64decode(token, validate=True).decode("utf-8")
+            except (binascii.Error, UnicodeDecodeError, ValueError):
+                decoded = ""
+            if ":" in decoded:
+                username, password = decoded.split(":", 1)
+                yield "basic-username", username.strip()
+                yield "basic-password", password.strip()
+            else:
+                yield "basic", decoded.strip()
+        else:
+            yield "authorization", normalized
+
+    # Alternate header names used by some clients
+    for header_name in _ALTERNATE_KEY_HEADERS:
+        yield header_name.decode("ascii"), clean(found.get(header_name))
+
+    # Query string fallbacks (?api_key=...); skip parsing when there is none
+    query_string = scope.get("query_string")
+    if query_string:
+        query_params = QueryParams(query_string)
+        for param_name in ("api_key", "key", "token"):
+            yield f"query:{param_name}", clean(query_params.get(param_name))
+
+
+def _is_authenticated(scope: Scope, path: str) -> bool:
+    """Check the supported credential locations for a valid API key."""
+    provided_schemes: list[str] = []
+    for source, candidate in _iter_credentials(scope):
+        # Absent or blank credentials never reach verify_api_key
+        if not candidate:
+            continue
+        if verify_api_key(candidate):
+            return True
+        provided_schemes.append(source)
+
+    unique_schemes = list(dict.fromkeys(provided_schemes)) or ["none"]
+    logger.warning(
+        "Unauthorized access attempt to %s (schemes=%s)",
+        path,
+        unique_schemes,
+    )
+    return False
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    """Authenticate HTTP requests hitting MCP endpoints."""
-
-    async def dispatch(self, request: Request, call_next):  # type: ignore[override]
-        if request.scope.get("type") != "http":
-            return await call_next(request)
-
-        if request.url.path in {"/health", "/"}:
-            return await call_next(request)
-
-        # Only enforce auth for MCP HTTP transports
-        if request.url.path not in {"/mcp", "/sse"}:
-            return await call_next(request)
-
-        candidate_keys: list[str] = []
-        provided_schemes: list[str] = []
-
-        def register_candidate(value: Optional[str], source: str) -> None:
-            if not value:
-                return
-            stripped = value.strip()
-            if not stripped:
-                return
-            candidate_keys.append(stripped)
-            provided_schemes.append(source)
-
-        auth_header = request.headers.get("authorization")
-        if auth_header:
-            normalized = auth_header.strip()
-            lower_normalized = normalized.lower()
-            if lower_normalized.startswith("bearer "):
-                register_candidate(normalized[7:], "bearer")
-            elif lower_normalized.startswith("basic "):
-                token = normalized[6:].strip()
-                try:
-                    decoded = base64.b64decode(token, validate=True).decode("utf-8")
-                except (binascii.Error, UnicodeDecodeError, ValueError):
-                    decoded = ""
-                if decoded:
-                    if ":" in decoded:
-                        username, password = decoded.split(":", 1)
-                        register_candidate(username, "basic-username")
-                        register_candidate(password, "basic-password")
-                    else:
-                        register_candidate(decoded, "basic")
-            else:
-                register_candidate(normalized, "authorization")
+class MCPGatewayMiddleware:
+    """Fix up, authenticate, and guard HTTP requests in a single middleware layer.
 
-        # Alternate header names used by some clients
-        for header_name in ("x-api-key", "api-key", "mcp-api-key"):
-            register_candidate(request.headers.get(header_name), header_name)
+    Accept-header normalization applies to /mcp, authentication to the MCP
+    HTTP transports (/mcp and /sse), and transport exceptions are converted
+    into friendly HTTP responses for every route. Implemented as plain ASGI
+    so requests are not routed through BaseHTTPMiddleware's task group and
+    memory streams.
+    """
 
-        # Query string fallbacks (?api_key=...)
-        for param_name in ("api_key", "key", "token"):
-            register_candidate(request.query_params.get(param_name), f"query:{param_name}")
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-        for candidate in candidate_keys:
-            if verify_api_key(candidate):
-                return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        unique_schemes = list(dict.fromkeys(provided_schemes)) or ["none"]
-        logger.warning(
-            "Unauthorized access attempt to %s (schemes=%s)",
-            request.url.path,
-            unique_schemes,
-        )
-        return JSONResponse(
-            {"error": "Invalid or missing API key"},
-            status_code=401,
-        )
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            # The raw ASGI path avoids building a URL object per request, and
+            # routes other than the MCP transports skip straight to the app.
+            path = scope["path"]
+            if path in _MCP_PATHS:
+                if not _is_authenticated(scope, path):
+                    await _UNAUTHORIZED_RESPONSE(scope, receive, send)
+                    return
+                if path == "/mcp":
+                    _force_accept_header(scope)
+
+            await self.app(scope, receive, send_wrapper)
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError) as exc:
+            # Both surface from the transport's streams when the client goes away
+            logger.info("Client disconnected - %s handled by middleware", type(exc).__name__)
+            if not response_started:
+                await _CLIENT_DISCONNECTED_RESPONSE(scope, receive, send)
+        except Exception as exc:
+            logger.error("Error in request processing: %s", exc, exc_info=True)
+            # Once headers are on the wire the response cannot be replaced
+            if response_started:
+                raise
+            response = ORJSONResponse(
+                content={"error": "Internal server error", "detail": str(exc)},
+                status_code=500,
+            )
+            await response(scope, receive, send)
 
 
 # Allow host/port to be configured via env without needing custom ASGI glue.
@@ -193,76 +307,151 @@ settings.host = os.getenv("HOST", "0.0.0.0")
 settings.port = int(os.getenv("PORT", "8000"))
 
 
+# Probe responses never change, so the whole response is built once at import
+_HEALTH_RESPONSE = Response(orjson.dumps({"status": "ok"}), media_type="application/json")
+
+
 @mcp.custom_route("/health", methods=["GET"])
 async def health_check(request: Request):
     """Simple health check used by container orchestration."""
-    return JSONResponse({"status": "ok"})
+    return _HEALTH_RESPONSE
 
 # Note: FastMCP handles routing internally for MCP endpoints
 # Health check and root endpoints will be handled by the error middleware
 # if they return 404, which is acceptable for an MCP server
 
+# Shared empty kwargs for calls without ``extra``; only ever unpacked, never mutated.
+_NO_EXTRA: Dict[str, Any] = {}
+
+
+# Completions for deterministic requests, keyed by (model, max_tokens, prompt
+# digest) and evicted least-recently-used first. Hashing the prompt keeps the
+# keys small regardless of prompt length.
+_response_cache: "OrderedDict[Tuple[str, Optional[int], bytes], Tuple[str, str]]" = OrderedDict()
+
+
+def _response_cache_key(model: str, max_tokens: Optional[int], prompt: str) -> Tuple[str, Optional[int], bytes]:
+    return model, max_tokens, hashlib.blake2b(prompt.encode(), digest_size=16).digest()
+
+
+def _response_cache_get(key: Tuple[str, Optional[int], bytes]) -> Optional[Tuple[str, str]]:
+    # Pop and re-insert rather than move_to_end so a concurrent clear() can't
+    # turn a hit into a KeyError
+    entry = _response_cache.pop(key, None)
+    if entry is not None:
+        _response_cache[key] = entry
+    return entry
+
+
+def _response_cache_put(key: Tuple[str, Optional[int], bytes], entry: Tuple[str, str]) -> None:
+    _response_cache.pop(key, None)
+    _response_cache[key] = entry
+    while len(_response_cache) > OPENAI_RESPONSE_CACHE_SIZE:
+        _response_cache.popitem(last=False)
+
+
+def _clear_response_cache() -> None:
+    logger.info("Received SIGHUP, clearing response cache")
+    _response_cache.clear()
+
+
+async def _close_stream(stream) -> None:
+    """Close an OpenAI response stream, logging instead of raising on failure."""
+    try:
+        await stream.close()
+    except Exception as exc:
+        logger.warning("Failed to close OpenAI response stream: %s", exc)
+
+
 @mcp.tool()
 async def generate(
-    prompt: str,
-    model: str = os.environ.get("OPENAI_MODEL", "gpt-4o-mini"),
-    temperature: float = float(os.environ.get("OPENAI_TEMPERATURE", "0.2")),
-    max_tokens: Optional[int] = None,
+    prompt: Annotated[str, Field(min_length=1, pattern=r"\S")],
+    model: str = OPENAI_MODEL,
+    temperature: Annotated[float, Field(ge=0, le=2)] = OPENAI_TEMPERATURE,
+    max_tokens: Optional[Annotated[int, Field(gt=0)]] = None,
     extra: Optional[Dict[str, Any]] = None,
     ctx: Optional[Context] = None,
 ) -> Dict[str, Any]:
     """
     Send a prompt to the OpenAI API and return the response text.
     Arguments:
-      - prompt: user text to send
+      - prompt: user text to send (must not be blank)
       - model: OpenAI model name (default: env OPENAI_MODEL or gpt-4o-mini)
-      - temperature: sampling temperature
-      - max_tokens: optional max output tokens
+      - temperature: sampling temperature between 0 and 2
+      - max_tokens: optional positive max output tokens
       - extra: optional dict forwarded to OpenAI (e.g., top_p, presence_penalty)
     Returns:
       { "text": str, "model": str, "finish_reason": str }
     """
     try:
-        if ctx:
-            await ctx.info(f"Dispatching prompt to OpenAI with model={model}")
-
-        # Validate input parameters
-        if not prompt or not prompt.strip():
-            raise ValueError("Prompt cannot be empty")
-        
-        if temperature < 0 or temperature > 2:
-            raise ValueError("Temperature must be between 0 and 2")
-        
-        if max_tokens is not None and max_tokens <= 0:
-            raise ValueError("max_tokens must be positive")
-
-        # Use Chat Completions for widest compatibility
-        resp = await client.chat.completions.create(
+        # Only deterministic requests without extra parameters are cacheable
+        cache_key = None
+        if temperature == 0 and not extra and OPENAI_RESPONSE_CACHE_SIZE > 0:
+            cache_key = _response_cache_key(model, max_tokens, prompt)
+            cached = _response_cache_get(cache_key)
+            if cached is not None:
+                text, finish = cached
+                if ctx:
+                    await ctx.info(f"Returned cached response with model={model}, finish_reason={finish}")
+                return {"text": text, "model": model, "finish_reason": finish}
+
+        # The tool always streams; a caller-supplied flag would clash with ours
+        if extra and "stream" in extra:
+            extra = {key: value for key, value in extra.items() if key != "stream"}
+
+        # Use Chat Completions for widest compatibility, streamed so tokens are
+        # consumed as they are generated instead of after the full completion
+        stream = await client.chat.completions.create(
             model=model,
             messages=[{"role": "user", "content": prompt}],
             temperature=temperature,
             max_tokens=max_tokens,
-            **(extra or {}),
+            stream=True,
+            **(extra or _NO_EXTRA),
         )
-        
-        if not resp.choices:
+
+        parts: list[str] = []
+        finish = None
+        received_choice = False
+        try:
+            async for chunk in stream:
+                for choice in chunk.choices:
+                    # With n > 1 the choices arrive interleaved; only the first is returned
+                    if choice.index != 0:
+                        continue
+                    received_choice = True
+                    delta = choice.delta.content
+                    if delta:
+                        parts.append(delta)
+                        # Forward deltas as progress; a no-op unless the client asked for it
+                        if ctx:
+                            await ctx.report_progress(len(parts), message=delta)
+                    if choice.finish_reason:
+                        finish = choice.finish_reason
+        finally:
+            # Always release the pooled connection, even if the stream fails midway
+            await _close_stream(stream)
+
+        if not received_choice:
             raise RuntimeError("No response choices returned from OpenAI")
-        
-        choice = resp.choices[0]
-        text = (choice.message.content or "").strip()
-        finish = choice.finish_reason or "stop"
 
+        text = "".join(parts).strip()
+        finish = finish or "stop"
+        if cache_key is not None:
+            _response_cache_put(cache_key, (text, finish))
+
+        # A single ctx.info per call; per-delta progress above is only sent when
+        # the client supplied a progress token
         if ctx:
-            await ctx.info(f"Successfully generated response with finish_reason: {finish}")
+            await ctx.info(f"Generated response with model={model}, finish_reason={finish}")
 
         return {"text": text, "model": model, "finish_reason": finish}
     
     except Exception as e:
-        error_msg = f"Error generating response: {str(e)}"
-        logger.error(error_msg)
-        
+        logger.error("Error generating response: %s", e)
+
         if ctx:
-            await ctx.error(error_msg)
+            await ctx.error(f"Error generating response: {e}")
         
         # Return error information instead of raising to prevent stream disconnection
         return {
@@ -273,16 +462,19 @@ async def generate(
         }
 
 HTTP_MIDDLEWARE = [
-    Middleware(ErrorHandlingMiddleware),
-    Middleware(AuthMiddleware),
-    Middleware(ForceAcceptHeaderMiddleware),
+    Middleware(MCPGatewayMiddleware),
 ]
 
 
 async def run_server_with_error_handling(transport, host, port):
     """Run the MCP server with comprehensive error handling for ClosedResourceError."""
     try:
-        logger.info(f"Starting MCP server on {host}:{port} with transport {transport}")
+        logger.info("Starting MCP server on %s:%s with transport %s", host, port, transport)
+
+        # Clear the cache from a loop callback so it never interrupts a coroutine
+        # mid-lookup (SIGHUP is POSIX-only)
+        if hasattr(signal, "SIGHUP"):
+            asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, _clear_response_cache)
         
         transport_kwargs = {}
         if transport in {"http", "streamable-http", "sse"}:
@@ -307,14 +499,19 @@ async def run_server_with_error_handling(transport, host, port):
         logger.info("Server shutdown requested")
         sys.exit(0)
     except Exception as e:
-        logger.error(f"Unexpected server error: {str(e)}")
+        logger.error("Unexpected server error: %s", e)
         # For other errors, we might want to restart or exit gracefully
         raise
+    finally:
+        # The OpenAI client and its connection pool live for the whole server run.
+        # FastMCP's own lifespan is entered per request in stateless HTTP mode,
+        # so cleanup is tied to the server run instead.
+        await client.close()
 
 def setup_signal_handlers():
     """Setup signal handlers for graceful shutdown."""
     def signal_handler(signum, frame):
-        logger.info(f"Received signal {signum}, shutting down gracefully...")
+        logger.info("Received signal %s, shutting down gracefully...", signum)
         sys.exit(0)
     
     signal.signal(signal.SIGINT, signal_handler)
@@ -323,6 +520,12 @@ def setup_signal_handlers():
 if __name__ == "__main__":
     import argparse
 
+    # uvloop is an optional, faster drop-in event loop (not available on Windows)
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+
     parser = argparse.ArgumentParser(description="OpenAI MCP Relay Server")
     parser.add_argument(
         "--transport",
@@ -341,17 +544,18 @@ if __name__ == "__main__":
     # Check if FastMCP supports async run
     if hasattr(mcp, 'run_async'):
         # Use async version with error handling
+        run = uvloop.run if uvloop is not None else asyncio.run
         try:
-            asyncio.run(run_server_with_error_handling(args.transport, host, port))
+            run(run_server_with_error_handling(args.transport, host, port))
         except KeyboardInterrupt:
             logger.info("Server stopped by user")
         except Exception as e:
-            logger.error(f"Server failed to start: {e}")
+            logger.error("Server failed to start: %s", e)
             sys.exit(1)
     else:
         # Fallback to synchronous version
         try:
-            logger.info(f"Starting MCP server on {host}:{port} with transport {args.transport}")
+            logger.info("Starting MCP server on %s:%s with transport %s", host, port, args.transport)
             mcp.run(
                 transport=args.transport, 
                 stateless_http=True,
@@ -361,7 +565,7 @@ if __name__ == "__main__":
         except KeyboardInterrupt:
             logger.info("Server stopped by user")
         except Exception as e:
-            logger.error(f"Server error: {e}")
+            logger.error("Server error: %s", e)
             # Don't exit on ClosedResourceError, just log it
-            if "ClosedResourceError" not in str(e):
+            if not isinstance(e, anyio.ClosedResourceError):
                 sys.exit(1)
@@ -18,7 +18,6 @@ def test_authentication():
     import server
     
     print(f"MCP API Key: {server.MCP_API_KEY}")
-    print(f"API Key Hash: {server.MCP_API_KEY_HASH}")
     
     # Test the verify_api_key function
     print("\nTesting verify_api_key function:")
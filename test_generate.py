@@ -0,0 +1,203 @@
+import os
+from types import SimpleNamespace
+
+# Ensure required environment variables exist before importing the server
+os.environ.setdefault("OPENAI_API_KEY", "test-key-for-generate")
+os.environ.setdefault("MCP_API_KEY", "test-mcp-key-123")
+
+import pytest
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+
+import server
+
+
+class FakeStream:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for chunk in self.chunks:
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+
+    async def close(self):
+        self.closed = True
+
+
+def make_chunk(content=None, finish_reason=None, index=0):
+    delta = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(index=index, delta=delta, finish_reason=finish_reason)])
+
+
+class FakeCompletions:
+    def __init__(self, text="hello", finish_reason="stop", error=None, chunks=None):
+        self.text = text
+        self.finish_reason = finish_reason
+        self.error = error
+        self.chunks = chunks
+        self.calls = []
+        self.streams = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        midpoint = len(self.text) // 2
+        chunks = self.chunks or [
+            make_chunk(self.text[:midpoint]),
+            self.error or make_chunk(self.text[midpoint:]),
+            make_chunk(finish_reason=self.finish_reason),
+        ]
+        stream = FakeStream(chunks)
+        self.streams.append(stream)
+        return stream
+
+
+class FakeContext:
+    def __init__(self):
+        self.messages = []
+
+    async def info(self, message):
+        self.messages.append(message)
+
+    async def report_progress(self, progress, total=None, message=None):
+        pass
+
+
+@pytest.fixture
+def use_completions(monkeypatch):
+    """Route server.client to a fake ``completions`` object, with an empty response cache."""
+
+    def install(completions):
+        monkeypatch.setattr(server, "client", SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+        return completions
+
+    server._response_cache.clear()
+    yield install
+    server._response_cache.clear()
+
+
+async def run_generate(**kwargs):
+    return await server.generate.fn(**kwargs)
+
+
+@pytest.mark.asyncio
+async def test_generate_returns_completion_text(use_completions):
+    completions = use_completions(FakeCompletions(text="  hi there  "))
+    result = await run_generate(prompt="Say hi", model="gpt-test", temperature=0.5)
+
+    assert result == {"text": "hi there", "model": "gpt-test", "finish_reason": "stop"}
+    call = completions.calls[0]
+    assert call["messages"] == [{"role": "user", "content": "Say hi"}]
+    assert call["temperature"] == 0.5
+    assert call["stream"] is True
+    assert completions.streams[0].closed is True
+
+
+@pytest.mark.asyncio
+async def test_generate_reports_length_finish_reason(use_completions):
+    use_completions(FakeCompletions(text="truncated", finish_reason="length"))
+    result = await run_generate(prompt="Say hi")
+
+    assert result["text"] == "truncated"
+    assert result["finish_reason"] == "length"
+
+
+@pytest.mark.asyncio
+async def test_generate_forwards_extra_parameters(use_completions):
+    completions = use_completions(FakeCompletions())
+    await run_generate(prompt="Say hi", extra={"top_p": 0.9})
+
+    assert completions.calls[0]["top_p"] == 0.9
+
+
+@pytest.mark.asyncio
+async def test_generate_ignores_stream_in_extra_parameters(use_completions):
+    completions = use_completions(FakeCompletions())
+    result = await run_generate(prompt="Say hi", extra={"stream": False, "top_p": 0.9})
+
+    assert result["text"] == "hello"
+    assert completions.calls[0]["stream"] is True
+    assert completions.calls[0]["top_p"] == 0.9
+
+
+@pytest.mark.asyncio
+async def test_generate_returns_only_first_choice_when_interleaved(use_completions):
+    use_completions(
+        FakeCompletions(
+            chunks=[
+                make_chunk("Hello ", index=0),
+                make_chunk("Bonjour ", index=1),
+                make_chunk("world", index=0),
+                make_chunk("monde", index=1),
+                make_chunk(finish_reason="stop", index=0),
+                make_chunk(finish_reason="length", index=1),
+            ]
+        )
+    )
+    result = await run_generate(prompt="Say hello", extra={"n": 2})
+
+    assert result == {"text": "Hello world", "model": server.OPENAI_MODEL, "finish_reason": "stop"}
+
+
+@pytest.mark.asyncio
+async def test_generate_caches_temperature_zero_responses(use_completions):
+    completions = use_completions(FakeCompletions(text="cached"))
+    ctx = FakeContext()
+
+    first = await run_generate(prompt="Same prompt", temperature=0)
+    second = await run_generate(prompt="Same prompt", temperature=0, ctx=ctx)
+    await run_generate(prompt="Same prompt", temperature=0, max_tokens=5)
+    await run_generate(prompt="Same prompt", temperature=0.7)
+    await run_generate(prompt="Same prompt", temperature=0, extra={"top_p": 0.5})
+
+    assert first == second == {"text": "cached", "model": server.OPENAI_MODEL, "finish_reason": "stop"}
+    assert len(completions.calls) == 4
+    assert ctx.messages == [f"Returned cached response with model={server.OPENAI_MODEL}, finish_reason=stop"]
+
+
+def test_response_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(server, "OPENAI_RESPONSE_CACHE_SIZE", 2)
+    server._response_cache.clear()
+    try:
+        server._response_cache_put("a", ("A", "stop"))
+        server._response_cache_put("b", ("B", "stop"))
+        assert server._response_cache_get("a") == ("A", "stop")
+        server._response_cache_put("c", ("C", "stop"))
+
+        assert list(server._response_cache) == ["a", "c"]
+        server._response_cache.clear()
+        assert server._response_cache_get("a") is None
+    finally:
+        server._response_cache.clear()
+
+
+async def call_tool_expecting_error(arguments):
+    async with Client(server.mcp) as mcp_client:
+        with pytest.raises(ToolError):
+            await mcp_client.call_tool("generate", arguments)
+
+
+@pytest.mark.asyncio
+async def test_generate_rejects_invalid_arguments_before_calling_openai(use_completions):
+    completions = use_completions(FakeCompletions())
+
+    await call_tool_expecting_error({"prompt": "Say hi", "temperature": 2.5})
+    await call_tool_expecting_error({"prompt": "   "})
+    await call_tool_expecting_error({"prompt": "Say hi", "max_tokens": 0})
+
+    assert completions.calls == []
+
+
+@pytest.mark.asyncio
+async def test_generate_closes_stream_when_it_fails_midway(use_completions):
+    completions = use_completions(FakeCompletions(error=RuntimeError("connection reset")))
+    result = await run_generate(prompt="Say hi")
+
+    assert result["error"] is True
+    assert "connection reset" in result["text"]
+    assert completions.streams[0].closed is True
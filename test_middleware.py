@@ -1,14 +1,20 @@
-import asyncio
 import base64
 import os
-from starlette.requests import Request
+import sys
+from types import SimpleNamespace
+
+import anyio
+import pytest
+from starlette.datastructures import Headers
 from starlette.responses import Response
 
 # Ensure required environment variables exist before importing the server
 os.environ.setdefault("OPENAI_API_KEY", "test-key-for-middleware")
 os.environ.setdefault("MCP_API_KEY", "test-mcp-key-123")
 
-from server import AuthMiddleware, ForceAcceptHeaderMiddleware
+from server import MCPGatewayMiddleware
+
+AUTH_HEADER = (b"authorization", b"Bearer test-mcp-key-123")
 
 
 async def empty_receive():
@@ -34,83 +40,161 @@ def build_scope(headers=None, path="/mcp", query_string: str | bytes = b""):
     }
 
 
-def test_force_accept_header_adds_missing_values():
-    async def runner():
-        scope = build_scope(headers=[(b"accept", b"application/json")])
-        request = Request(scope, empty_receive)
-        recorded = {}
+def collect_response(messages):
+    start = next(message for message in messages if message["type"] == "http.response.start")
+    body = b"".join(message.get("body", b"") for message in messages if message["type"] == "http.response.body")
+    return SimpleNamespace(
+        status_code=start["status"],
+        headers=Headers(raw=start["headers"]),
+        body=body,
+    )
+
+
+async def run_gateway(headers=None, path="/mcp", query_string="", app=None):
+    scope = build_scope(headers=headers, path=path, query_string=query_string)
+    state = {"called": False}
+    messages = []
+
+    async def default_app(scope, receive, send):
+        state["called"] = True
+        state["accept"] = Headers(scope=scope).get("accept")
+        await Response(status_code=204)(scope, receive, send)
+
+    async def send(message):
+        messages.append(message)
+
+    middleware = MCPGatewayMiddleware(app or default_app)
+    await middleware(scope, empty_receive, send)
+    return state, collect_response(messages), scope
+
+
+@pytest.mark.asyncio
+async def test_force_accept_header_adds_missing_values():
+    state, _, _ = await run_gateway(headers=[AUTH_HEADER, (b"accept", b"application/json")])
+
+    accept_header = state["accept"]
+    assert "application/json" in accept_header
+    assert "text/event-stream" in accept_header
+
+
+@pytest.mark.asyncio
+async def test_force_accept_header_rewrites_scope_headers_in_place():
+    raw_headers = [AUTH_HEADER, (b"accept", b"application/json")]
+    _, _, scope = await run_gateway(headers=raw_headers)
+    assert scope["headers"] == [
+        AUTH_HEADER,
+        (b"accept", b"application/json, text/event-stream"),
+    ]
 
-        async def call_next(req):
-            recorded["accept"] = req.headers.get("accept")
-            return Response()
+    _, _, scope = await run_gateway(headers=[AUTH_HEADER])
+    assert scope["headers"] == [
+        AUTH_HEADER,
+        (b"accept", b"application/json, text/event-stream"),
+    ]
 
-        middleware = ForceAcceptHeaderMiddleware(app=lambda scope, receive, send: None)
-        await middleware.dispatch(request, call_next)
 
-        accept_header = recorded["accept"]
-        assert "application/json" in accept_header
-        assert "text/event-stream" in accept_header
+@pytest.mark.asyncio
+async def test_force_accept_header_handles_tuple_scope_headers():
+    _, _, scope = await run_gateway(headers=(AUTH_HEADER, (b"accept", b"application/json")))
+    assert scope["headers"] == [
+        AUTH_HEADER,
+        (b"accept", b"application/json, text/event-stream"),
+    ]
 
-    asyncio.run(runner())
 
+@pytest.mark.asyncio
+async def test_force_accept_header_leaves_compliant_requests_untouched():
+    raw_headers = [AUTH_HEADER, (b"accept", b"Text/Event-Stream, Application/JSON")]
+    state, _, scope = await run_gateway(headers=list(raw_headers))
 
-def run_auth_middleware(headers=None, path="/mcp", query_string=""):
-    async def runner():
-        scope = build_scope(headers=headers, path=path, query_string=query_string)
-        request = Request(scope, empty_receive)
-        middleware = AuthMiddleware(app=lambda scope, receive, send: None)
-        state = {"called": False}
+    assert state["accept"] == "Text/Event-Stream, Application/JSON"
+    assert scope["headers"] == raw_headers
 
-        async def call_next(req):
-            state["called"] = True
-            return Response(status_code=204)
 
-        response = await middleware.dispatch(request, call_next)
-        return state["called"], response
+@pytest.mark.asyncio
+async def test_force_accept_header_skips_unrelated_paths():
+    state, _, _ = await run_gateway(headers=[(b"accept", b"application/json")], path="/other")
 
-    return asyncio.run(runner())
+    assert state["accept"] == "application/json"
 
 
-def test_auth_middleware_accepts_bearer_header():
-    headers = [(b"authorization", b"Bearer test-mcp-key-123")]
-    called, response = run_auth_middleware(headers=headers)
-    assert called is True
+@pytest.mark.asyncio
+async def test_auth_middleware_accepts_bearer_header():
+    state, response, _ = await run_gateway(headers=[AUTH_HEADER])
+    assert state["called"] is True
     assert response.status_code == 204
 
 
-def test_auth_middleware_accepts_basic_header():
+@pytest.mark.asyncio
+async def test_auth_middleware_accepts_basic_header():
     token = base64.b64encode(b"test-mcp-key-123:").decode("ascii")
     headers = [(b"authorization", f"Basic {token}".encode("ascii"))]
-    called, response = run_auth_middleware(headers=headers)
-    assert called is True
+    state, response, _ = await run_gateway(headers=headers)
+    assert state["called"] is True
     assert response.status_code == 204
 
 
-def test_auth_middleware_accepts_query_parameter():
-    called, response = run_auth_middleware(query_string="api_key=test-mcp-key-123")
-    assert called is True
+@pytest.mark.asyncio
+async def test_auth_middleware_accepts_query_parameter():
+    state, response, _ = await run_gateway(query_string="api_key=test-mcp-key-123")
+    assert state["called"] is True
     assert response.status_code == 204
 
 
-def test_auth_middleware_rejects_missing_credentials():
-    called, response = run_auth_middleware(headers=[])
-    assert called is False
+@pytest.mark.asyncio
+async def test_auth_middleware_falls_back_to_later_credentials():
+    headers = [(b"authorization", b"Bearer wrong-key"), (b"x-api-key", b"test-mcp-key-123")]
+    state, response, _ = await run_gateway(headers=headers)
+    assert state["called"] is True
+    assert response.status_code == 204
+
+
+@pytest.mark.asyncio
+async def test_auth_middleware_rejects_missing_credentials():
+    state, response, _ = await run_gateway(headers=[])
+    assert state["called"] is False
     assert response.status_code == 401
+    assert response.headers["content-type"] == "application/json"
+    assert response.body == b'{"error":"Invalid or missing API key"}'
+
+
+@pytest.mark.asyncio
+async def test_auth_middleware_allows_health_without_credentials():
+    state, response, _ = await run_gateway(headers=[], path="/health")
+    assert state["called"] is True
+    assert response.status_code == 204
+
+
+@pytest.mark.asyncio
+async def test_gateway_converts_disconnects_and_errors():
+    async def disconnected(scope, receive, send):
+        raise anyio.ClosedResourceError()
+
+    async def broken(scope, receive, send):
+        raise RuntimeError("boom")
+
+    async def broken_pipe(scope, receive, send):
+        raise anyio.BrokenResourceError()
+
+    _, response, _ = await run_gateway(headers=[AUTH_HEADER], app=disconnected)
+    assert response.status_code == 499
+
+    _, response, _ = await run_gateway(headers=[AUTH_HEADER], app=broken_pipe)
+    assert response.status_code == 499
 
+    _, response, _ = await run_gateway(headers=[AUTH_HEADER], app=broken)
+    assert response.status_code == 500
 
-def test_force_accept_header_skips_unrelated_paths():
-    async def runner():
-        scope = build_scope(headers=[(b"accept", b"application/json")], path="/other")
-        request = Request(scope, empty_receive)
-        recorded = {}
 
-        async def call_next(req):
-            recorded["accept"] = req.headers.get("accept")
-            return Response()
+@pytest.mark.asyncio
+async def test_gateway_reraises_errors_after_response_started():
+    async def broken_mid_stream(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        raise RuntimeError("boom")
 
-        middleware = ForceAcceptHeaderMiddleware(app=lambda scope, receive, send: None)
-        await middleware.dispatch(request, call_next)
+    with pytest.raises(RuntimeError):
+        await run_gateway(headers=[AUTH_HEADER], app=broken_mid_stream)
 
-        assert recorded["accept"] == "application/json"
 
-    asyncio.run(runner())
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
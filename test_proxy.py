@@ -0,0 +1,131 @@
+import httpx
+import pytest
+
+import proxy
+
+
+async def run_proxy_request(handler, content=b'{"jsonrpc": "2.0"}', headers=None):
+    """Send a POST /mcp through the proxy with the upstream replaced by ``handler``."""
+    upstream = httpx.AsyncClient(
+        base_url="http://upstream", transport=httpx.MockTransport(handler)
+    )
+    previous = proxy.client
+    proxy.client = upstream
+    try:
+        transport = httpx.ASGITransport(app=proxy.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://proxy") as caller:
+            response = await caller.post("/mcp", content=content, headers=headers or {})
+            return response, response.content
+    finally:
+        proxy.client = previous
+        await upstream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_lifespan_manages_shared_client():
+    async with proxy.lifespan(proxy.app):
+        shared = proxy.client
+        assert isinstance(shared, httpx.AsyncClient)
+        assert str(shared.base_url).rstrip("/") == proxy.TARGET_HOST
+    assert shared.is_closed
+    assert proxy.client is None
+
+
+@pytest.mark.asyncio
+async def test_proxy_forwards_to_upstream_mcp_endpoint():
+    seen = {}
+
+    def handler(request):
+        seen["url"] = str(request.url)
+        seen["accept"] = request.headers.get("accept")
+        seen["body"] = request.read()
+        return httpx.Response(200, content=b"ok")
+
+    response, body = await run_proxy_request(handler, headers={"accept": "application/json"})
+
+    assert response.status_code == 200
+    assert body == b"ok"
+    assert seen["url"] == "http://upstream/mcp"
+    assert seen["accept"] == "application/json, text/event-stream"
+    assert seen["body"] == b'{"jsonrpc": "2.0"}'
+
+
+@pytest.mark.asyncio
+async def test_proxy_streams_request_body_without_content_length():
+    seen = {}
+
+    def handler(request):
+        seen["content-length"] = request.headers.get("content-length")
+        seen["transfer-encoding"] = request.headers.get("transfer-encoding")
+        seen["body"] = request.read()
+        return httpx.Response(200)
+
+    payload = b"x" * 65536
+    response, _ = await run_proxy_request(handler, content=payload)
+
+    assert response.status_code == 200
+    assert seen["content-length"] is None
+    assert seen["transfer-encoding"] == "chunked"
+    assert seen["body"] == payload
+
+
+@pytest.mark.asyncio
+async def test_proxy_drops_hop_by_hop_request_headers():
+    seen = {}
+
+    def handler(request):
+        seen["headers"] = request.headers
+        return httpx.Response(200)
+
+    headers = {
+        "connection": "Upgrade",
+        "keep-alive": "timeout=5",
+        "upgrade": "h2c",
+        "authorization": "Bearer test-key",
+        "x-custom": "value",
+    }
+    await run_proxy_request(handler, headers=headers)
+
+    forwarded = seen["headers"]
+    assert "keep-alive" not in forwarded
+    assert "upgrade" not in forwarded
+    assert forwarded.get("connection") != "Upgrade"
+    assert forwarded["authorization"] == "Bearer test-key"
+    assert forwarded["x-custom"] == "value"
+    assert forwarded.get_list("host") == ["localhost:8000"]
+    assert forwarded.get_list("accept") == ["application/json, text/event-stream"]
+
+
+@pytest.mark.asyncio
+async def test_proxy_filters_response_headers_and_closes_upstream():
+    closed = {}
+
+    class TrackingStream(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            yield b"data: {}\n\n"
+
+        async def aclose(self):
+            closed["upstream"] = True
+
+    def handler(request):
+        return httpx.Response(
+            200,
+            headers=[
+                ("Content-Type", "text/event-stream"),
+                ("Content-Length", "10"),
+                ("Connection", "keep-alive"),
+                ("Mcp-Session-Id", "abc"),
+                ("Set-Cookie", "a=1"),
+                ("Set-Cookie", "b=2"),
+            ],
+            stream=TrackingStream(),
+        )
+
+    response, body = await run_proxy_request(handler)
+
+    assert body == b"data: {}\n\n"
+    assert response.headers["content-type"] == "text/event-stream"
+    assert response.headers["mcp-session-id"] == "abc"
+    assert response.headers.get_list("set-cookie") == ["a=1", "b=2"]
+    assert "content-length" not in response.headers
+    assert closed.get("upstream") is True